@@ -1,9 +1,9 @@
-import re
-import subprocess
+import asyncio
+import tempfile
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 
-from io import BytesIO
-
 from telegram import Update, Message, MessageEntity, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     CommandHandler,
@@ -19,9 +19,11 @@ from telegramify_markdown import markdownify
 
 from . import requests, telegraph, config, __version__
 from .log import logger
-from .helpers import chunker, escape_markdown_v2, normalize_url
+from .helpers import chunker, escape_markdown_v2, extract_url_title_labels, is_valid_url, normalize_url
 from .readeck_client import (
+    auth_headers,
     fetch_bookmarks,
+    fetch_bookmark_details,
     fetch_article_epub,
     save_bookmark,
     fetch_article_markdown,
@@ -36,6 +38,18 @@ from .readeck_client import (
 import os
 import sys
 
+_uid_cache: dict[int, str] = {}
+
+
+def _uid(user_id: int) -> str:
+    """Cached, interned str(user_id): it keys a token lookup on every update."""
+    try:
+        return _uid_cache[user_id]
+    except KeyError:
+        uid = _uid_cache[user_id] = sys.intern(str(user_id))
+        return uid
+
+
 try:
     import llm
 
@@ -69,14 +83,16 @@ async def start(update: Update, context: CallbackContext) -> None:
 
 async def version_command(update: Update, context: CallbackContext) -> None:
     """Reply with the current bot and readeck backend version."""
-    readeck_version = get_readeck_version()
+    # Memoized after the first call; the initial fork/exec runs in a
+    # thread so it doesn't stall the event loop.
+    readeck_version = await asyncio.to_thread(get_readeck_version)
     await update.message.reply_text(f"Readeckbot version: {__version__}\n{readeck_version}")
 
 
 async def restart_command(update: Update, context: CallbackContext) -> None:
     """Restart the bot process (systemd will relaunch it, useful for upgrades). Only admins can use this."""
     user_id = update.effective_user.id
-    token = config.USER_TOKEN_MAP.get(str(user_id))
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
     if not token:
         await update.message.reply_text("You must register your Readeck token to use this command.")
         return
@@ -92,6 +108,89 @@ async def restart_command(update: Update, context: CallbackContext) -> None:
     os._exit(0)
 
 
+# Telegram splits long pastes at 4096 chars; messages near that size are
+# buffered briefly so their continuation can be joined before parsing.
+PASTE_SPLIT_THRESHOLD = 4000
+PASTE_FLUSH_DELAY = 0.6
+PASTE_CONTINUATION_DELAY = 2.0
+
+_pending_pastes: dict[int, list[str]] = {}
+_pending_paste_tasks: dict[int, asyncio.Task] = {}
+
+# Strong refs to fire-and-forget tasks so they aren't garbage collected
+_background_tasks: set[asyncio.Task] = set()
+
+# Saves currently in flight, so a double-tapped message reuses the first
+# POST instead of creating a duplicate bookmark.
+_inflight_saves: dict[tuple[int, str], asyncio.Task] = {}
+
+
+async def save_bookmark_coalesced(user_id: int, url: str, token: str, title: str | None = None) -> str:
+    key = (user_id, url)
+    if task := _inflight_saves.get(key):
+        return await asyncio.shield(task)
+    task = asyncio.ensure_future(save_bookmark(url, token, title=title))
+    _inflight_saves[key] = task
+    try:
+        return await task
+    finally:
+        _inflight_saves.pop(key, None)
+
+
+def fire_and_forget(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def _flush_paste(message: Message, chat_id: int, delay: float) -> None:
+    """Wait for a possible continuation, then parse the joined paste."""
+    await asyncio.sleep(delay)
+    text = "".join(_pending_pastes.pop(chat_id, []))
+    _pending_paste_tasks.pop(chat_id, None)
+
+    # This runs as a detached task, outside the dispatcher's
+    # error_handler; report failures ourselves instead of losing them.
+    try:
+        url, _, _ = extract_url_title_labels(text)
+        if not url:
+            return
+        url = normalize_url(url)
+        if not is_valid_url(url):
+            return
+        token = config.USER_TOKEN_MAP.get_by_int(message.from_user.id)
+        if not token:
+            await message.reply_text(
+                "I don't have your Readeck token. Set it with /token <YOUR_TOKEN> or /register <password>."
+            )
+            return
+        bookmark_id = await save_bookmark_coalesced(message.from_user.id, url, token)
+        await reply_details(message, token, bookmark_id)
+        logger.info(f"Saved bookmark with ID {bookmark_id}")
+    except Exception:
+        logger.error("Exception while saving a pasted bookmark:", exc_info=True)
+        try:
+            await message.reply_text("Having troubles now... try later.")
+        except Exception as e:
+            logger.error(f"Error sending error message: {e}")
+
+
+async def _reply_details_safely(
+    message: Message, token: str, bookmark_id: str, title: str | None = None, url: str | None = None
+) -> None:
+    # Detached-task wrapper: like _flush_paste, this runs outside the
+    # dispatcher's error_handler, so failures must be reported here.
+    try:
+        await reply_details(message, token, bookmark_id, title=title, url=url)
+    except Exception:
+        logger.error("Exception while replying bookmark details:", exc_info=True)
+        try:
+            await message.reply_text("Having troubles now... try later.")
+        except Exception as e:
+            logger.error(f"Error sending error message: {e}")
+
+
 async def handle_message(update: Update, context: CallbackContext) -> None:
     """
     Handle non-command text messages:
@@ -100,20 +199,48 @@ async def handle_message(update: Update, context: CallbackContext) -> None:
     """
     user_id = update.effective_user.id
 
-    token = config.USER_TOKEN_MAP.get(str(user_id))
+    text = update.message.text or ""
+    chat_id = update.message.chat_id
+    if chat_id in _pending_pastes or len(text) >= PASTE_SPLIT_THRESHOLD:
+        _pending_pastes.setdefault(chat_id, []).append(text)
+        if task := _pending_paste_tasks.pop(chat_id, None):
+            task.cancel()
+        delay = PASTE_CONTINUATION_DELAY if len(text) >= PASTE_SPLIT_THRESHOLD else PASTE_FLUSH_DELAY
+        _pending_paste_tasks[chat_id] = asyncio.create_task(_flush_paste(update.message, chat_id, delay))
+        return
+
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
 
-    for ent in update.message.entities:
-        if ent.type == MessageEntity.TEXT_LINK:
-            url = ent.url
-        elif ent.type == MessageEntity.URL:
-            url = normalize_url(update.message.parse_entity(ent))
-        else:
+    # parse_entities slices the UTF-16 offsets once for all entities,
+    # instead of one parse_entity pass per URL.
+    parsed = update.message.parse_entities(types=[MessageEntity.URL, MessageEntity.TEXT_LINK])
+
+    # Text around the URL is only an unambiguous user-supplied title when
+    # there is exactly one URL; with several, the leftover is mostly the
+    # other URLs and would mislabel every bookmark.
+    title = extract_url_title_labels(text)[1] if len(parsed) == 1 else None
+
+    urls = []
+    for ent, value in parsed.items():
+        url = ent.url if ent.type == MessageEntity.TEXT_LINK else normalize_url(value)
+
+        if not is_valid_url(url):
+            await update.message.reply_text(f"{url} doesn't look like a valid URL.")
             continue
+        urls.append(url)
 
-        bookmark_id = await save_bookmark(url, token)
-        await reply_details(update.message, token, bookmark_id)
+    async def save(url: str) -> None:
+        bookmark_id = await save_bookmark_coalesced(user_id, url, token, title=title)
+        # The handler is done once the POST succeeded; the detail reply can
+        # complete in the background without holding up further updates.
+        fire_and_forget(_reply_details_safely(update.message, token, bookmark_id, title=title, url=url))
         logger.info(f"Saved bookmark with ID {bookmark_id}")
 
+    # The URLs are independent, so a message with several of them costs
+    # one round-trip instead of one per URL.
+    if urls:
+        await asyncio.gather(*(save(url) for url in urls))
+
 
 async def register_command(update: Update, context: CallbackContext) -> None:
     """
@@ -146,11 +273,23 @@ async def token_command(update: Update, context: CallbackContext) -> None:
         await update.message.reply_text("Usage: /token <YOUR_READECK_TOKEN>")
         return
     token = context.args[0]
-    config.USER_TOKEN_MAP[str(user_id)] = token
+    config.USER_TOKEN_MAP[_uid(user_id)] = token
     await update.message.reply_text("Your Readeck token has been saved.")
     logger.info(f"Set token for user_id={user_id}")
 
 
+async def run_command(command: list[str], **kw) -> tuple[int, str]:
+    """Run a command without blocking the event loop; return (returncode, stderr)."""
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        **kw,
+    )
+    _, stderr = await process.communicate()
+    return process.returncode, stderr.decode()
+
+
 async def register_and_fetch_token(update: Update, username: str, password: str):
     """
     Register a new user in Readeck and fetch the corresponding token.
@@ -158,20 +297,19 @@ async def register_and_fetch_token(update: Update, username: str, password: str)
     If it fails, try via Docker.
     Then obtain the token via the API.
     """
-    command = (
-        ["readeck", "user"]
-        + (["-config", config.READECK_CONFIG] if config.READECK_CONFIG else [])
-        + ["-u", username, "-p", password]
-    )
+    command = ["readeck", "user"]
+    if config.READECK_CONFIG:
+        command += ["-config", config.READECK_CONFIG]
+    command += ["-u", username, "-p", password]
     logger.info(f"Attempting to register user '{username}' using CLI")
     logger.debug(f"CLI command: {command}")
     kw = {}
     if config.READECK_DATA:
         logger.info(f"Using READECK_DATA={config.READECK_DATA}")
         kw["cwd"] = Path(config.READECK_DATA).parent
-    result = subprocess.run(command, capture_output=True, text=True, **kw)
-    if result.returncode != 0:
-        logger.warning(f"CLI command failed: {result.stderr.strip()}, trying docker")
+    returncode, stderr = await run_command(command, **kw)
+    if returncode != 0:
+        logger.warning(f"CLI command failed: {stderr.strip()}, trying docker")
         docker_command = [
             "docker",
             "run",
@@ -183,10 +321,10 @@ async def register_and_fetch_token(update: Update, username: str, password: str)
             "-p",
             password,
         ]
-        result = subprocess.run(docker_command, capture_output=True, text=True)
-        if result.returncode != 0:
-            await update.message.reply_text(f"Registration failed: {result.stderr.strip()}")
-            logger.error(f"Registration failed with docker: {result.stderr.strip()}")
+        returncode, stderr = await run_command(docker_command)
+        if returncode != 0:
+            await update.message.reply_text(f"Registration failed: {stderr.strip()}")
+            logger.error(f"Registration failed with docker: {stderr.strip()}")
             return
 
     logger.info(f"User '{username}' registered successfully. Fetching token...")
@@ -204,7 +342,7 @@ async def register_and_fetch_token(update: Update, username: str, password: str)
     data = r.json()
     token = data.get("token")
     if token:
-        config.USER_TOKEN_MAP[str(update.effective_user.id)] = token
+        config.USER_TOKEN_MAP[_uid(update.effective_user.id)] = token
         await update.message.reply_text("Registration successful! Your token has been saved.")
         logger.info(f"Token for user '{username}' saved for Telegram user {update.effective_user.id}")
     else:
@@ -212,6 +350,9 @@ async def register_and_fetch_token(update: Update, username: str, password: str)
         logger.error("Token missing in auth response.")
 
 
+# Markups are immutable, so identical (bookmark, state) combinations can
+# share one instance instead of re-allocating the button objects per tap.
+@lru_cache(maxsize=1024)
 def build_inline_keyboard(
     bookmark_id,
     is_favorite,
@@ -255,20 +396,20 @@ def build_inline_keyboard(
     return InlineKeyboardMarkup(keyboard)
 
 
-async def reply_details(message: Message, token: str, bookmark_id: str):
+async def reply_details(
+    message: Message, token: str, bookmark_id: str, title: str | None = None, url: str | None = None
+):
     """Reply with details about the saved bookmark. Include a keyboard of actions"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json",
-    }
-    details = await requests.get(f"{config.READECK_BASE_URL}/api/bookmarks/{bookmark_id}", headers=headers)
-    details.raise_for_status()
-    info = details.json()
-    logger.info(info)
-    title = info.get("title") or info.get("url")
-    url = info.get("url")
-    is_favorite = info.get("is_marked", False)
+    if title and url:
+        # The caller already knows everything the reply needs (a freshly saved
+        # bookmark is never a favorite), so skip the detail round-trip.
+        is_favorite = False
+    else:
+        info = await fetch_bookmark_details(bookmark_id, token)
+        logger.info(info)
+        title = info.get("title") or info.get("url")
+        url = info.get("url")
+        is_favorite = info.get("is_marked", False)
     reply_markup = build_inline_keyboard(
         bookmark_id,
         is_favorite,
@@ -289,7 +430,7 @@ async def summarize_handler(update: Update, context: CallbackContext) -> None:
     # Parse bookmark_id from "summarize_<bookmark_id>"
     _, bookmark_id = query.data.split("_", 1)
     user_id = update.effective_user.id
-    token = config.USER_TOKEN_MAP.get(str(user_id))
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
 
     article_text = await fetch_article_markdown(bookmark_id, token)
 
@@ -318,19 +459,43 @@ async def summarize_handler(update: Update, context: CallbackContext) -> None:
     await query.message.reply_text(summary)
 
 
+class _BookmarkCommandFilter(filters.MessageFilter):
+    """
+    Dispatch filter for /b_<bookmark_id>. A prefix check is enough to
+    route the update; it runs on every text message, so skip the regex
+    engine here and leave the strict match to the handler.
+    """
+
+    def filter(self, message):
+        text = message.text
+        return bool(text) and text.startswith("/b_") and len(text) > 3
+
+
+bookmark_command_filter = _BookmarkCommandFilter(name="readeckbot.bookmark_command")
+
+
 async def handle_detail_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     command = update.message.text
-    match = re.match(r"^/b_(\w+)", command)
-    if not match:
+    # The filter guaranteed the /b_ prefix; take the first token after it
+    # (there may be none, e.g. "/b_ ") and validate it is a plain id
+    # without re-running a regex.
+    parts = command[3:].split(None, 1)
+    bookmark_id = parts[0] if parts else ""
+    if not bookmark_id.replace("_", "").isalnum():
         await update.message.reply_text("Invalid command format. Use /b_<bookmark_id>")
         return
 
-    bookmark_id = match.group(1)
     user_id = update.effective_user.id
-    token = config.USER_TOKEN_MAP.get(str(user_id))
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
     await reply_details(update.message, token, bookmark_id)
 
 
+# Chunked articles per (user, bookmark), so each "Next" click reuses the
+# split from the first page instead of re-fetching the whole markdown.
+_chunk_cache: OrderedDict[tuple[int, str], list[str]] = OrderedDict()
+CHUNK_CACHE_MAX = 256
+
+
 async def read_handler(update: Update, context: CallbackContext) -> None:
     """
     Handle dynamic read_<bookmark_id> to fetch markdown.
@@ -340,37 +505,36 @@ async def read_handler(update: Update, context: CallbackContext) -> None:
 
     text = query.data.strip()
 
-    try:
-        _, bookmark_id, chunk_n = text.split("_")
-        chunk_n = int(chunk_n)
-    except ValueError:
-        # first page: it has no chunk suffix
-        _, bookmark_id = text.split("_")
-        chunk_n = 0
+    # "read_<id>" for the first page, "read_<id>_<n>" afterwards; one
+    # split covers both without raising on the common first-page case.
+    parts = text.split("_", 2)
+    bookmark_id = parts[1]
+    chunk_n = int(parts[2]) if len(parts) > 2 else 0
 
     user_id = update.effective_user.id
-    token = config.USER_TOKEN_MAP.get(str(user_id))
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
     if not token:
         await query.message.reply_text(
             "I don't have your Readeck token. Set it with /token <YOUR_TOKEN> or /register <password>."
         )
-    article_text = await fetch_article_markdown(bookmark_id, token)
-    article_chunks = chunker(article_text)
+    cache_key = (user_id, bookmark_id)
+    article_chunks = _chunk_cache.get(cache_key)
+    if article_chunks is None:
+        article_chunks = chunker(await fetch_article_markdown(bookmark_id, token))
+        _chunk_cache[cache_key] = article_chunks
+        if len(_chunk_cache) > CHUNK_CACHE_MAX:
+            _chunk_cache.popitem(last=False)
+    else:
+        _chunk_cache.move_to_end(cache_key)
     chunk = article_chunks[chunk_n]
 
     if chunk_n < len(article_chunks) - 1:
         button_read = InlineKeyboardButton("Next", callback_data=f"read_{bookmark_id}_{chunk_n + 1}")
         reply_markup = InlineKeyboardMarkup([[button_read]])
     else:
-        # Last chunk, show Archive and Favorite toggle buttons
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "accept": "application/json",
-            "content-type": "application/json",
-        }
-        details = await requests.get(f"{config.READECK_BASE_URL}/api/bookmarks/{bookmark_id}", headers=headers)
-        details.raise_for_status()
-        info = details.json()
+        # Last chunk, show Archive and Favorite toggle buttons; only this
+        # page needs the bookmark details (served from the TTL cache).
+        info = await fetch_bookmark_details(bookmark_id, token)
         is_favorite = info.get("is_marked", False)
         reply_markup = build_inline_keyboard(
             bookmark_id,
@@ -388,7 +552,7 @@ async def read_handler(update: Update, context: CallbackContext) -> None:
 async def archive_bookmark_handler(update: Update, context: CallbackContext) -> None:
     """Archive a bookmark by its ID."""
     user_id = update.effective_user.id
-    token = config.USER_TOKEN_MAP.get(str(user_id))
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
     query = update.callback_query
     await query.answer()
 
@@ -403,7 +567,7 @@ async def archive_bookmark_handler(update: Update, context: CallbackContext) ->
 async def favorite_bookmark_handler(update: Update, context: CallbackContext) -> None:
     """Toggle favorite status and update the inline keyboard (emoji only, toggle style)."""
     user_id = update.effective_user.id
-    token = config.USER_TOKEN_MAP.get(str(user_id))
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
     query = update.callback_query
     await query.answer()
 
@@ -414,15 +578,9 @@ async def favorite_bookmark_handler(update: Update, context: CallbackContext) ->
     else:
         await unfavorite_bookmark(bookmark_id, token)
 
-    # Fetch updated details to get new favorite state
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json",
-    }
-    details = await requests.get(f"{config.READECK_BASE_URL}/api/bookmarks/{bookmark_id}", headers=headers)
-    details.raise_for_status()
-    info = details.json()
+    # Fetch updated details to get new favorite state (the PATCH above
+    # evicted the cached entry, so this read is fresh)
+    info = await fetch_bookmark_details(bookmark_id, token)
     is_favorite = info.get("is_marked", False)
 
     # Try to detect context (detail or end-of-article) by inspecting the message text/buttons if needed
@@ -468,7 +626,7 @@ async def epub_handler(update: Update, context: CallbackContext) -> None:
     _, bookmark_id = text.split("_")
 
     user_id = update.effective_user.id
-    token = config.USER_TOKEN_MAP.get(str(user_id))
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
     if not token:
         await query.message.reply_text(
             "I don't have your Readeck token. Set it with /token <YOUR_TOKEN> or /register <password>."
@@ -486,17 +644,13 @@ async def epub_handler(update: Update, context: CallbackContext) -> None:
 async def epub_command(update: Update, context: CallbackContext) -> None:
     """Generate an epub of all unread bookmarks, send it, and archive them."""
     user_id = update.effective_user.id
-    token = config.USER_TOKEN_MAP.get(str(user_id))
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
     if not token:
         await update.message.reply_text(
             "I don't have your Readeck token. Set it with /token <YOUR_TOKEN> or /register <password>."
         )
         return
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "content-type": "application/json",
-    }
     # Define el filtro: bookmarks no archivados.
     params = {
         "author": "",
@@ -509,7 +663,7 @@ async def epub_command(update: Update, context: CallbackContext) -> None:
 
     # Step 1: unarchive bookmarks
     list_url = f"{config.READECK_BASE_URL}/api/bookmarks"
-    list_response = await requests.get(list_url, headers={**headers, "accept": "application/json"}, params=params)
+    list_response = await requests.get(list_url, headers=auth_headers(token), params=params)
 
     bookmarks = list_response.json()
     bookmark_ids = [b.get("id") for b in bookmarks if b.get("id")]
@@ -520,51 +674,78 @@ async def epub_command(update: Update, context: CallbackContext) -> None:
 
     await update.message.reply_text(f"Found {len(bookmark_ids)} unread bookmarks. Downloading epub.")
 
+    # Stream the epub to a spooled file (spills to disk past 8 MB) instead
+    # of materializing the whole export in memory.
     epub_url = f"{config.READECK_BASE_URL}/api/bookmarks/export.epub"
-    epub_response = await requests.get(
+    epub_file = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    async with requests.client.stream(
+        "GET",
         epub_url,
-        headers={"Authorization": f"Bearer {token}", "accept": "application/epub+zip"},
+        headers=auth_headers(token, accept="application/epub+zip"),
         params=params,
-    )
-
-    # Fetch the epub file
-    epub_bytes = BytesIO(epub_response.content)
-    epub_bytes.name = "bookmarks.epub"
+    ) as epub_response:
+        epub_response.raise_for_status()
+        async for chunk in epub_response.aiter_bytes(65536):
+            epub_file.write(chunk)
+    epub_file.seek(0)
     await update.message.reply_document(
-        document=epub_bytes,
+        document=epub_file,
         filename="bookmarks.epub",
         caption="Here is your epub file.",
     )
 
-    # archive
-    for bid in bookmark_ids:
-        patch_url = f"{config.READECK_BASE_URL}/api/bookmarks/{bid}"
-        patch_payload = {"is_archived": True}
-        r = await requests.patch(patch_url, headers=headers, json=patch_payload)
-        logger.info(f"Archived {bid} bookmark: {r.status_code}")
+    # Archive all of them concurrently (Readeck has no bulk-update
+    # endpoint); archive_bookmark also invalidates the cached listings
+    # and details, unlike a raw PATCH.
+    await asyncio.gather(*(archive_bookmark(bid, token) for bid in bookmark_ids))
+    logger.info(f"Archived {len(bookmark_ids)} bookmarks")
+
+
+MARKDOWNIFY_OFFLOAD_THRESHOLD = 2048
+
+
+async def render_markdown(message: str) -> str:
+    """markdownify is regex-heavy pure Python; push big inputs to a thread."""
+    if len(message) > MARKDOWNIFY_OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(markdownify, message)
+    return markdownify(message)
 
 
 def format_list(bookmarks):
     """Format a list of bookmarks for display."""
-    lines = []
-    for bookmark in bookmarks:
-        title = bookmark.get("title", "No Title")
-        url = bookmark.get("url", "")
-        lines.append(f"- [{title}]({url}) | /b_{bookmark['id']}")
-    return "\n".join(lines)
+    return "\n".join(f"- [{b.get('title', 'No Title')}]({b.get('url', '')}) | /b_{b['id']}" for b in bookmarks)
+
+
+# Rendered listings, keyed like the command that produced them, bounded
+# by a small LRU. An entry is reused only while fetch_bookmarks keeps
+# returning the very same cached list object, so it can never serve
+# data the listing cache has already dropped.
+_list_render_cache: OrderedDict[tuple, tuple[object, str]] = OrderedDict()
+LIST_RENDER_CACHE_MAX = 256
+
+
+async def render_list(cache_key: tuple, bookmarks) -> str:
+    cached = _list_render_cache.get(cache_key)
+    if cached and cached[0] is bookmarks:
+        _list_render_cache.move_to_end(cache_key)
+        return cached[1]
+    rendered = await render_markdown(format_list(bookmarks))
+    _list_render_cache[cache_key] = (bookmarks, rendered)
+    _list_render_cache.move_to_end(cache_key)
+    if len(_list_render_cache) > LIST_RENDER_CACHE_MAX:
+        _list_render_cache.popitem(last=False)
+    return rendered
 
 
 async def unarchived_command(update: Update, context: CallbackContext) -> None:
     """List all unarchived bookmarks"""
     user_id = update.effective_user.id
-    token = config.USER_TOKEN_MAP.get(str(user_id))
-    bookmarks = await fetch_bookmarks(token, is_archived=False)
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
+    bookmarks = await fetch_bookmarks(token, is_archived=False, limit=config.BOOKMARK_LIST_LIMIT)
     if not bookmarks:
         await update.message.reply_text("No unarchived bookmarks found.")
         return
-    message = format_list(bookmarks)
-    # TODO format markdown
-    await update.message.reply_markdown_v2(markdownify(message))
+    await update.message.reply_markdown_v2(await render_list((token, "unarchived"), bookmarks))
 
 
 async def search_command(update: Update, context: CallbackContext) -> None:
@@ -574,14 +755,12 @@ async def search_command(update: Update, context: CallbackContext) -> None:
     if not query:
         await update.message.reply_text("Please provide a search query.")
         return
-    token = config.USER_TOKEN_MAP.get(str(user_id))
-    bookmarks = await fetch_bookmarks(token, search=query)
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
+    bookmarks = await fetch_bookmarks(token, search=query, limit=config.BOOKMARK_LIST_LIMIT)
     if not bookmarks:
         await update.message.reply_text("No bookmarks found.")
         return
-    message = format_list(bookmarks)
-    # TODO format markdown
-    await update.message.reply_markdown_v2(markdownify(message))
+    await update.message.reply_markdown_v2(await render_list((token, "search", query), bookmarks))
 
 
 async def publish_handler(update: Update, context: CallbackContext) -> None:
@@ -602,7 +781,7 @@ async def publish_handler(update: Update, context: CallbackContext) -> None:
         return
 
     # Retrieve the user's Readeck token
-    token = config.USER_TOKEN_MAP.get(str(user_id))
+    token = config.USER_TOKEN_MAP.get_by_int(user_id)
     if not token:
         await query.message.reply_text("I don't have your Readeck token. Use /token or /register <password>.")
         return
@@ -623,8 +802,27 @@ async def error_handler(update: object, context: CallbackContext) -> None:
             logger.error(f"Error sending error message: {e}")
 
 
+async def _close_http_client(application) -> None:
+    await requests.client.aclose()
+
+
 def main():
-    application = ApplicationBuilder().token(config.TELEGRAM_BOT_TOKEN).build()
+    # Process updates concurrently so a slow Readeck call for one chat
+    # doesn't block updates from every other chat.
+    builder = (
+        ApplicationBuilder().token(config.TELEGRAM_BOT_TOKEN).concurrent_updates(True).post_shutdown(_close_http_client)
+    )
+    try:
+        from telegram.ext import AIORateLimiter
+
+        # Pace outbound messages against Telegram's bot-wide 30 msg/s limit
+        # so long reads don't trip 429s mid-stream.
+        builder = builder.rate_limiter(AIORateLimiter())
+    except (ImportError, RuntimeError):
+        # Recent PTB imports fine and raises RuntimeError from the
+        # constructor when the rate-limiter extra is missing.
+        logger.warning("aiolimiter not installed. Outbound messages are not rate limited.")
+    application = builder.build()
 
     # Command handlers
     application.add_handler(CommandHandler("start", start))
@@ -647,12 +845,19 @@ def main():
         application.add_handler(CallbackQueryHandler(summarize_handler, pattern=r"^summarize_"))
 
     # Non-command messages (likely bookmarks)
-    application.add_handler(MessageHandler(filters.Regex(r"^/b_\w+"), handle_detail_command))
+    application.add_handler(MessageHandler(bookmark_command_filter, handle_detail_command))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
 
     application.add_error_handler(error_handler)
 
-    application.run_polling()
+    if config.WEBHOOK_URL:
+        application.run_webhook(
+            listen=config.WEBHOOK_LISTEN,
+            port=config.WEBHOOK_PORT,
+            webhook_url=config.WEBHOOK_URL,
+        )
+    else:
+        application.run_polling()
 
 
 if __name__ == "__main__":
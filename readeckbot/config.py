@@ -19,8 +19,18 @@ LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.0-flash-lite")
 LLM_KEY = os.getenv("LLM_KEY")
 LLM_SUMMARY_MAX_LENGTH = int(os.getenv("LLM_SUMMARY_MAX_LENGTH", "2500"))
 
+# Cap for /unarchived and /search listings: keeps the response payload
+# (and its JSON parse) bounded for users with large collections.
+BOOKMARK_LIST_LIMIT = int(os.getenv("BOOKMARK_LIST_LIMIT", "100"))
+
 USER_TELEGRAPH = PersistentDict(str(Path.cwd() / ".user_telegraph.json"))
 
+# When WEBHOOK_URL is set the bot receives updates pushed by Telegram
+# instead of long polling.
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", None)
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))
+
 
 __all__ = [
     "TELEGRAM_BOT_TOKEN",
@@ -32,4 +42,8 @@ __all__ = [
     "LLM_MODEL",
     "LLM_KEY",
     "LLM_SUMMARY_MAX_LENGTH",
+    "BOOKMARK_LIST_LIMIT",
+    "WEBHOOK_URL",
+    "WEBHOOK_LISTEN",
+    "WEBHOOK_PORT",
 ]
@@ -1,16 +1,24 @@
 from pathlib import Path
 
-from urllib.parse import urlparse
-
+import atexit
+import os
 import re
-import json
+
+import orjson
+
+from .log import logger
 
 
 def chunker(article_text: str, limit: int = 4000) -> list[str]:
     """
-    Split the article text into chunks of `limit` characters, taking the last dot as limit
+    Split the article text into chunks of at most `limit` characters,
+    preferring paragraph breaks, then line breaks, then sentence ends,
+    then word boundaries; only hard-cut when none is found.
     """
     if len(article_text) <= limit:
+        if article_text and not article_text[0].isspace() and not article_text[-1].isspace():
+            # Already trimmed: avoid the copy strip() would make.
+            return [article_text]
         stripped = article_text.strip()
         return [stripped] if stripped else []
 
@@ -19,85 +27,170 @@ def chunker(article_text: str, limit: int = 4000) -> list[str]:
     text_len = len(article_text)
 
     while start < text_len:
-        # Set end limit for this chunk
-        end = min(start + limit, text_len)
-
-        # Look for the last dot in the range start:end
-        last_dot = article_text.rfind(".", start, end)
-
-        if last_dot == -1 or last_dot <= start:
-            # No dot found in range; extend to next dot after limit
-            next_dot = article_text.find(".", end)
-            if next_dot == -1:
-                # No more dots at all; just take the rest
-                chunks.append(article_text[start:].strip())
-                break
-            else:
-                chunks.append(article_text[start : next_dot + 1].strip())
-                start = next_dot + 1
+        end = start + limit
+        if end >= text_len:
+            end = text_len
         else:
-            chunks.append(article_text[start : last_dot + 1].strip())
-            start = last_dot + 1
+            # `keep` is how many separator chars belong to this chunk
+            # (the trailing dot of a sentence stays with it).
+            for sep, keep in (("\n\n", 0), ("\n", 0), (". ", 1), (" ", 0)):
+                boundary = article_text.rfind(sep, start, end)
+                if boundary > start:
+                    end = boundary + keep
+                    break
 
-    return [c.strip() for c in chunks if c.strip()]
+        chunk = article_text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end
+
+    return chunks
 
 
 class PersistentDict(dict):
     """
     A simple persistent dictionary stored as JSON using pathlib.
-    Automatically saves on each set or delete operation.
+
+    Mutations are appended to a sidecar log file (one JSON line each) and
+    replayed on load, so a set or delete costs one small append instead of
+    rewriting the whole map. Every `compact_every` writes the log is folded
+    back into the JSON snapshot.
     """
 
+    compact_every = 100
+
     def __init__(self, filename: str):
         super().__init__()
         self.path = Path(filename)
-        if self.path.exists():
+        self.log_path = self.path.with_suffix(self.path.suffix + ".log")
+        try:
+            data = orjson.loads(self.path.read_bytes())
+            if isinstance(data, dict):
+                self.update(data)
+        except FileNotFoundError:
+            pass
+        except orjson.JSONDecodeError:
+            logger.warning(f"Ignoring corrupt snapshot {self.path}; starting from the log only")
+        self._replay_log()
+        # Opened lazily on first append so importing config doesn't
+        # litter the working directory with empty log files.
+        self._log = None
+        self._writes = 0
+        # JSON forces string keys; mirror the digit ones by int so hot
+        # lookups (Telegram user ids) skip the str() conversion.
+        self._int_cache = {int(k): v for k, v in self.items() if k.isdigit()}
+        atexit.register(self._flush_on_exit)
+
+    def _replay_log(self):
+        if not self.log_path.exists():
+            return
+        for line in self.log_path.read_bytes().splitlines():
             try:
-                data = json.loads(self.path.read_text())
-                if isinstance(data, dict):
-                    self.update(data)
+                entry = orjson.loads(line)
             except Exception:
-                pass
+                continue
+            if entry.get("del"):
+                super().pop(entry["k"], None)
+            else:
+                super().__setitem__(entry["k"], entry["v"])
 
     def __setitem__(self, key, value):
         super().__setitem__(key, value)
-        self._save()
+        if isinstance(key, str) and key.isdigit():
+            self._int_cache[int(key)] = value
+        self._append({"k": key, "v": value})
 
     def __delitem__(self, key):
         super().__delitem__(key)
-        self._save()
-
-    def _save(self):
-        self.path.write_text(json.dumps(self, indent=2))
+        if isinstance(key, str) and key.isdigit():
+            self._int_cache.pop(int(key), None)
+        self._append({"k": key, "del": True})
+
+    def get_by_int(self, key: int, default=None):
+        """Lookup by int key without stringifying it."""
+        return self._int_cache.get(key, default)
+
+    def _append(self, entry):
+        if self._log is None:
+            self._log = self.log_path.open("ab")
+        self._log.write(orjson.dumps(entry) + b"\n")
+        self._log.flush()
+        self._writes += 1
+        if self._writes >= self.compact_every:
+            self.compact()
+
+    def _flush_on_exit(self):
+        # Leave a fresh snapshot behind so the next start skips the replay.
+        try:
+            if self._writes:
+                self.compact()
+            if self._log is not None:
+                self._log.close()
+        except Exception:
+            pass
+
+    def compact(self):
+        """Fold the log back into the snapshot and truncate it."""
+        # Write to a sibling and swap it in so a crash mid-write can't leave
+        # a truncated snapshot behind.
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_bytes(orjson.dumps(dict(self)))
+        os.replace(tmp, self.path)
+        if self._log is not None:
+            self._log.seek(0)
+            self._log.truncate()
+        self._writes = 0
+
+
+# Characters MarkdownV2 requires escaping; translate does the whole pass
+# with a C-level table lookup instead of the regex engine.
+ESCAPE_MD_V2_TABLE = str.maketrans({c: f"\\{c}" for c in "_*[]()~`>#+-=|{}.!"})
+URL_RE = re.compile(r"https?://\S+")
+LABEL_RE = re.compile(r"\+(\w+)")
 
 
 def escape_markdown_v2(text: str) -> str:
-    return re.sub(r"([_*\[\]()~`>#+\-=|{}.!])", r"\\\1", text)
+    return text.translate(ESCAPE_MD_V2_TABLE)
 
 
-async def extract_url_title_labels(text: str):
+def extract_url_title_labels(text: str):
     """Extract URL, title, and labels from text."""
-    url_pattern = r"(https?://[^\s]+)"
-    match = re.search(url_pattern, text)
+    # C-level substring check before bringing in the regex machinery;
+    # most pastes without a URL bail out here.
+    if "http" not in text:
+        return None, None, []
+    match = URL_RE.search(text)
     if not match:
         return None, None, []
     url = match.group(0)
-    after_url = text.replace(url, "").strip()
-    labels = re.findall(r"\+(\w+)", after_url)
-    for lbl in labels:
-        after_url = after_url.replace(f"+{lbl}", "")
-    title = after_url.strip()
+    # Cut the URL out by its span instead of rescanning the text for it.
+    after_url = f"{text[: match.start()]} {text[match.end() :]}"
+    labels = LABEL_RE.findall(after_url)
+    title = LABEL_RE.sub("", after_url).strip()
     return url, (title if title else None), labels
 
 
+def is_valid_url(url: str) -> bool:
+    """
+    Cheap sanity check (scheme, dotted host, length bound) so junk input
+    is rejected before paying a Readeck round-trip.
+    """
+    if not url.startswith(("http://", "https://")) or len(url) > 2048:
+        return False
+    parts = url.split("/", 3)
+    return len(parts) > 2 and "." in parts[2]
+
+
 def normalize_url(url: str) -> str:
     """
     Guarantee that the URL starts with a scheme and
     remove trailing punctuation such as commas or periods.
     """
     url = url.strip(".,:;!?)]}")
-    if not urlparse(url).scheme:
-        url = f"https://{url}"
+    # A prefix check is all the scheme detection needs; urlparse would
+    # scan the whole URL and allocate a ParseResult just for this.
+    if not url.startswith(("http://", "https://")):
+        url = "https://" + url
     return url
 
 
@@ -1,14 +1,79 @@
 from typing import Any
-from io import BytesIO
+from collections import OrderedDict
+from functools import cache, lru_cache
+import asyncio
 import subprocess
+import tempfile
+import time
+
+import httpx
+import orjson
 
 from .config import READECK_BASE_URL
 from . import requests
 
+# Pre-parsed endpoint URLs: httpx takes URL instances as-is, skipping a
+# parse per request. Per-bookmark paths share the same prefix string.
+BOOKMARKS_URL = httpx.URL(f"{READECK_BASE_URL}/api/bookmarks")
+PROFILE_URL = httpx.URL(f"{READECK_BASE_URL}/api/profile")
+BOOKMARK_PREFIX = f"{READECK_BASE_URL}/api/bookmarks/"
+
+# Bookmark-list responses are cached briefly per (token, params) so
+# back-to-back commands hitting the same listing don't re-query Readeck.
+# Keys include arbitrary search strings, so the cache is LRU bounded
+# rather than left to grow with every distinct query.
+LIST_CACHE_TTL = 5.0
+LIST_CACHE_MAX = 256
+_list_cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+
+
+def _invalidate_list_cache(token: str) -> None:
+    for key in [k for k in _list_cache if k[0] == token]:
+        del _list_cache[key]
+
+
+# Detail responses get a longer TTL: they only change when this bot
+# mutates the bookmark, and every mutation invalidates its entry. LRU
+# bounded so expired payloads don't accumulate for the process lifetime.
+DETAIL_CACHE_TTL = 60.0
+DETAIL_CACHE_MAX = 1024
+_detail_cache: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+
+
+# Bodies above this size are parsed in a thread: a big listing shouldn't
+# stall every other coroutine while orjson chews on it.
+PARSE_OFFLOAD_THRESHOLD = 32 * 1024
+
+
+async def _parse_json(raw: bytes) -> Any:
+    if len(raw) > PARSE_OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(orjson.loads, raw)
+    return orjson.loads(raw)
+
 
+@lru_cache(maxsize=4096)
+def bearer(token: str) -> str:
+    """Cached "Bearer <token>" header value, formatted once per token."""
+    return f"Bearer {token}"
+
+
+@lru_cache(maxsize=4096)
+def auth_headers(token: str, accept: str = "application/json", content_type: str | None = None) -> dict[str, str]:
+    """
+    Shared per-token header dict, built once per (token, accept,
+    content-type) combination. Callers must treat it as frozen.
+    """
+    headers = {"Authorization": bearer(token), "accept": accept}
+    if content_type:
+        headers["content-type"] = content_type
+    return headers
+
+
+@cache
 def get_readeck_version() -> str:
     """
     Returns the version string of the installed readeck binary.
+    The binary doesn't change while the bot runs, so ask it only once.
     """
     try:
         result = subprocess.run(["readeck", "version"], capture_output=True, text=True, check=True)
@@ -18,21 +83,30 @@ def get_readeck_version() -> str:
         return f"Could not determine readeck version: {e}"
 
 
+# Roles rarely change mid-session; remember the answer per token for a
+# while. A replaced token is a new key, so no explicit invalidation needed.
+ADMIN_CACHE_TTL = 300.0
+_admin_cache: dict[str, tuple[float, bool]] = {}
+
+
 async def is_admin_user(token: str) -> bool:
     """
     Checks if the user associated with the given token is an admin in Readeck.
     """
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-    }
+    cached = _admin_cache.get(token)
+    if cached and time.monotonic() - cached[0] < ADMIN_CACHE_TTL:
+        return cached[1]
     try:
-        resp = await requests.get(f"{READECK_BASE_URL}/api/profile", headers=headers)
-        data = await resp.json()
+        resp = await requests.get(PROFILE_URL, headers=auth_headers(token))
+        data = await _parse_json(resp.content)
         roles = data.get("provider", {}).get("roles", [])
-        return "admin" in roles
+        is_admin = "admin" in roles
     except Exception:
+        # Don't cache failures: a transient error shouldn't lock a real
+        # admin out for the whole TTL.
         return False
+    _admin_cache[token] = (time.monotonic(), is_admin)
+    return is_admin
 
 
 async def fetch_bookmarks(
@@ -58,113 +132,151 @@ async def fetch_bookmarks(
     offset: int | None = None,
     sort: list[str] | None = None,
 ) -> dict[str, Any]:
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-    }
-
-    # Prepare query parameters, skipping any that are None
-    params = {
-        "author": author,
-        "is_archived": is_archived,
-        "search": search,
-        "site": site,
-        "title": title,
-        "type": type_,
-        "labels": labels,
-        "is_loaded": is_loaded,
-        "has_errors": has_errors,
-        "has_labels": has_labels,
-        "is_marked": is_marked,
-        "range_start": range_start,
-        "range_end": range_end,
-        "read_status": read_status,
-        "updated_since": updated_since,
-        "id": bookmark_id,
-        "collection": collection,
-        "limit": limit,
-        "offset": offset,
-        "sort": sort,
+    # Build only the non-None query parameters in a single pass (typical
+    # calls set two or three of the twenty).
+    filtered_params = {
+        k: v
+        for k, v in (
+            ("author", author),
+            ("is_archived", is_archived),
+            ("search", search),
+            ("site", site),
+            ("title", title),
+            ("type", type_),
+            ("labels", labels),
+            ("is_loaded", is_loaded),
+            ("has_errors", has_errors),
+            ("has_labels", has_labels),
+            ("is_marked", is_marked),
+            ("range_start", range_start),
+            ("range_end", range_end),
+            ("read_status", read_status),
+            ("updated_since", updated_since),
+            ("id", bookmark_id),
+            ("collection", collection),
+            ("limit", limit),
+            ("offset", offset),
+            ("sort", sort),
+        )
+        if v is not None
     }
 
-    # Remove keys with None values
-    filtered_params = {k: v for k, v in params.items() if v is not None}
+    cache_key = (token, repr(sorted(filtered_params.items())))
+    cached = _list_cache.get(cache_key)
+    if cached:
+        if time.monotonic() - cached[0] < LIST_CACHE_TTL:
+            _list_cache.move_to_end(cache_key)
+            return cached[1]
+        del _list_cache[cache_key]
 
     response = await requests.get(
-        f"{READECK_BASE_URL}/api/bookmarks",
-        headers=headers,
+        BOOKMARKS_URL,
+        headers=auth_headers(token),
         params=filtered_params,
     )
     response.raise_for_status()
-    return response.json()
+    # Parse the (potentially large) listing with orjson straight from bytes
+    data = await _parse_json(response.content)
+    _list_cache[cache_key] = (time.monotonic(), data)
+    while len(_list_cache) > LIST_CACHE_MAX:
+        _list_cache.popitem(last=False)
+    return data
 
 
-async def fetch_article_epub(bookmark_id: str, token: str):
-    """Fetch the markdown of a bookmark by its ID."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "text/epub+zip",
-    }
-    r = await requests.get(f"{READECK_BASE_URL}/api/bookmarks/{bookmark_id}/article.epub", headers=headers)
+async def fetch_bookmark_details(bookmark_id: str, token: str) -> dict[str, Any]:
+    """Fetch a bookmark's metadata, cached briefly per (token, id)."""
+    key = (token, bookmark_id)
+    cached = _detail_cache.get(key)
+    if cached:
+        if time.monotonic() - cached[0] < DETAIL_CACHE_TTL:
+            _detail_cache.move_to_end(key)
+            return cached[1]
+        del _detail_cache[key]
+    r = await requests.get(f"{BOOKMARK_PREFIX}{bookmark_id}", headers=auth_headers(token))
     r.raise_for_status()
-    return BytesIO(r.content)
+    data = orjson.loads(r.content)
+    _detail_cache[key] = (time.monotonic(), data)
+    while len(_detail_cache) > DETAIL_CACHE_MAX:
+        _detail_cache.popitem(last=False)
+    return data
 
 
-async def save_bookmark(url: str, token: str):
+async def fetch_article_epub(bookmark_id: str, token: str):
+    """
+    Fetch the epub of a bookmark by its ID, streamed into a spooled file
+    (spills to disk past 8 MB) rather than held whole in memory.
+    """
+    epub_file = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    async with requests.client.stream(
+        "GET",
+        f"{BOOKMARK_PREFIX}{bookmark_id}/article.epub",
+        headers=auth_headers(token, accept="text/epub+zip"),
+    ) as r:
+        r.raise_for_status()
+        async for chunk in r.aiter_bytes(65536):
+            epub_file.write(chunk)
+    epub_file.seek(0)
+    return epub_file
+
+
+async def save_bookmark(url: str, token: str, title: str | None = None):
     """Save a bookmark to Readeck and return a link and the bookmark_id."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "application/json",
-        "content-type": "application/json",
-    }
+    payload = {"url": url}
+    if title:
+        payload["title"] = title
 
-    r = await requests.post(f"{READECK_BASE_URL}/api/bookmarks", json={"url": url}, headers=headers)
+    r = await requests.post(
+        BOOKMARKS_URL,
+        content=orjson.dumps(payload),
+        headers=auth_headers(token, content_type="application/json"),
+    )
     r.raise_for_status()
+    _invalidate_list_cache(token)
     return r.headers.get("Bookmark-Id")
 
 
+# The PATCH bodies never change; encode them once.
+ARCHIVE_BODY = orjson.dumps({"is_archived": True})
+MARK_BODY = orjson.dumps({"is_marked": True})
+UNMARK_BODY = orjson.dumps({"is_marked": False})
+
+
 async def archive_bookmark(bookmark_id: str, token: str):
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "content-type": "application/json",
-    }
-    patch_url = f"{READECK_BASE_URL}/api/bookmarks/{bookmark_id}"
-    payload = {"is_archived": True}
-    response = await requests.patch(patch_url, headers=headers, json=payload)
+    patch_url = f"{BOOKMARK_PREFIX}{bookmark_id}"
+    response = await requests.patch(
+        patch_url, headers=auth_headers(token, content_type="application/json"), content=ARCHIVE_BODY
+    )
     response.raise_for_status()
+    _invalidate_list_cache(token)
+    _detail_cache.pop((token, bookmark_id), None)
     return True
 
 
 async def favorite_bookmark(bookmark_id: str, token: str):
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "content-type": "application/json",
-    }
-    patch_url = f"{READECK_BASE_URL}/api/bookmarks/{bookmark_id}"
-    payload = {"is_marked": True}
-    response = await requests.patch(patch_url, headers=headers, json=payload)
+    patch_url = f"{BOOKMARK_PREFIX}{bookmark_id}"
+    response = await requests.patch(
+        patch_url, headers=auth_headers(token, content_type="application/json"), content=MARK_BODY
+    )
     response.raise_for_status()
+    _invalidate_list_cache(token)
+    _detail_cache.pop((token, bookmark_id), None)
     return True
 
 
 async def unfavorite_bookmark(bookmark_id: str, token: str):
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "content-type": "application/json",
-    }
-    patch_url = f"{READECK_BASE_URL}/api/bookmarks/{bookmark_id}"
-    payload = {"is_marked": False}
-    response = await requests.patch(patch_url, headers=headers, json=payload)
+    patch_url = f"{BOOKMARK_PREFIX}{bookmark_id}"
+    response = await requests.patch(
+        patch_url, headers=auth_headers(token, content_type="application/json"), content=UNMARK_BODY
+    )
     response.raise_for_status()
+    _invalidate_list_cache(token)
+    _detail_cache.pop((token, bookmark_id), None)
     return True
 
 
 async def fetch_article_markdown(bookmark_id: str, token: str):
     """Fetch the markdown of a bookmark by its ID."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "accept": "text/markdown",
-    }
-    r = await requests.get(f"{READECK_BASE_URL}/api/bookmarks/{bookmark_id}/article.md", headers=headers)
-    r.raise_for_status()
-    return r.text
+    return await requests.get_text(
+        f"{BOOKMARK_PREFIX}{bookmark_id}/article.md",
+        headers=auth_headers(token, accept="text/markdown"),
+    )
@@ -1,9 +1,20 @@
 import httpx
 
+# A single shared client so keep-alive connections to Readeck are pooled and
+# reused across calls instead of paying a TCP+TLS handshake per request.
+# The pool is sized for concurrent update handling: an exhausted pool would
+# silently drop keep-alive connections and reintroduce per-call handshakes.
+client = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        retries=2,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    ),
+    headers={"accept": "application/json"},
+)
+
 
 async def fetch(method: str, url: str, **kwargs) -> httpx.Response:
-    async with httpx.AsyncClient() as client:
-        response = await client.request(method, url, **kwargs)
+    response = await client.request(method, url, **kwargs)
     response.raise_for_status()
     return response
 
@@ -12,6 +23,19 @@ async def get(url: str, **kwargs) -> httpx.Response:
     return await fetch("GET", url, **kwargs)
 
 
+async def get_text(url: str, **kwargs) -> str:
+    """
+    GET a text body, streaming and decoding it in chunks. The raw bytes
+    are released as they are decoded; the decoded chunks still briefly
+    coexist with the joined result, so peak memory is about twice the
+    text size (versus three times for buffering the bytes whole).
+    """
+    async with client.stream("GET", url, **kwargs) as response:
+        response.raise_for_status()
+        chunks = [chunk async for chunk in response.aiter_text()]
+    return "".join(chunks)
+
+
 async def post(url: str, **kwargs) -> httpx.Response:
     return await fetch("POST", url, **kwargs)
 
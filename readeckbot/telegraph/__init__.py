@@ -4,7 +4,15 @@ from ytelegraph import TelegraphAPI
 from .md_to_dom import md_to_dom
 
 
+# One client per user: constructing TelegraphAPI is not free (it may hit
+# the Telegraph API for the account) and the token never changes between
+# publishes.
+_clients: dict[int, TelegraphAPI] = {}
+
+
 async def get_telegraph_client(effective_user) -> TelegraphAPI:
+    if ph := _clients.get(effective_user.id):
+        return ph
     user_id = str(effective_user.id)
     telegraph_account = USER_TELEGRAPH.get(user_id)
     if telegraph_account:
@@ -22,6 +30,7 @@ async def get_telegraph_client(effective_user) -> TelegraphAPI:
             "access_token": telegraph_token,
             "author_name": telegram_user,
         }
+    _clients[effective_user.id] = ph
     return ph
 
 
@@ -33,9 +42,13 @@ async def create_page(effective_user, raw_content: str) -> str:
     ph = await get_telegraph_client(effective_user)
 
     dom = md_to_dom(content)
-    # Optionally remove the first node if it redundantly contains the title
-    if dom and title in dom[0]["children"]:
-        dom = dom[1:]
+    # Optionally remove the first node if it redundantly contains the
+    # title: a repeated title can only be the node's first text child, so
+    # check just that and delete in place rather than copying the list.
+    if dom:
+        first_children = dom[0].get("children") or []
+        if first_children and isinstance(first_children[0], str) and title in first_children[0]:
+            del dom[0]
     # Publish the markdown as a Telegraph page.
     page_link = ph.create_page(title, dom)
     return page_link
@@ -1,5 +1,5 @@
 import pytest
-from readeckbot.helpers import chunker
+from readeckbot.helpers import PersistentDict, chunker, is_valid_url
 
 
 @pytest.mark.parametrize(
@@ -31,14 +31,26 @@ def test_chunker_split_on_period(text, limit, expected):
 
 
 @pytest.mark.parametrize(
-    "text,limit",
+    "text,limit,expected",
     [
-        ("No periods here at all", 10),
-        ("Another example without punctuation", 15),
+        ("No periods here at all", 10, ["No", "periods", "here at", "all"]),
+        ("Another example without punctuation", 15, ["Another", "example", "without", "punctuation"]),
     ],
 )
-def test_chunker_no_periods(text, limit):
-    assert chunker(text, limit) == [text.strip()]
+def test_chunker_no_periods_splits_on_spaces(text, limit, expected):
+    # Without sentence boundaries the chunker falls back to word
+    # boundaries instead of overflowing the limit.
+    assert chunker(text, limit) == expected
+
+
+def test_chunker_prefers_paragraph_breaks():
+    text = "First paragraph here.\n\nSecond paragraph. It has two sentences."
+    assert chunker(text, 40) == ["First paragraph here.", "Second paragraph. It has two sentences."]
+
+
+def test_chunker_never_exceeds_limit():
+    text = "wordswithoutanyseparators" * 10
+    assert all(len(c) <= 30 for c in chunker(text, 30))
 
 
 def test_chunker_empty_string():
@@ -63,3 +75,41 @@ def test_chunker_trailing_spaces():
     text = "First sentence.  Second sentence.   Third sentence. "
     expected = ["First sentence.", "Second sentence.", "Third sentence."]
     assert chunker(text, 20) == expected
+
+
+def test_persistent_dict_reload(tmp_path):
+    path = tmp_path / "tokens.json"
+    d = PersistentDict(str(path))
+    d["1"] = "a"
+    d["2"] = "b"
+    del d["1"]
+    reloaded = PersistentDict(str(path))
+    assert dict(reloaded) == {"2": "b"}
+    assert reloaded.get_by_int(2) == "b"
+    assert reloaded.get_by_int(1) is None
+
+
+def test_persistent_dict_compaction(tmp_path):
+    path = tmp_path / "tokens.json"
+    d = PersistentDict(str(path))
+    d.compact_every = 3
+    d["1"] = "a"
+    d["2"] = "b"
+    assert d.log_path.read_text()  # mutations only appended so far
+    d["3"] = "c"  # triggers compaction
+    assert d.log_path.read_text() == ""
+    assert dict(PersistentDict(str(path))) == {"1": "a", "2": "b", "3": "c"}
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://example.com/article", True),
+        ("http://sub.example.com", True),
+        ("https://nodots/path", False),
+        ("ftp://example.com", False),
+        ("https://" + "a" * 2050, False),
+    ],
+)
+def test_is_valid_url(url, expected):
+    assert is_valid_url(url) is expected
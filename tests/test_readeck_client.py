@@ -10,6 +10,7 @@ async def test_get_readeck_version_success(mocker):
             self.stdout = "readeck version: 0.19.2"
 
     mocker.patch("subprocess.run", return_value=DummyCompletedProcess())
+    rc.get_readeck_version.cache_clear()
     version = rc.get_readeck_version()
     assert version == "readeck version: 0.19.2"
 
@@ -17,32 +18,37 @@ async def test_get_readeck_version_success(mocker):
 @pytest.mark.asyncio
 async def test_get_readeck_version_failure(mocker):
     mocker.patch("subprocess.run", side_effect=FileNotFoundError("not found"))
+    rc.get_readeck_version.cache_clear()
     version = rc.get_readeck_version()
     assert "Could not determine readeck version" in version
 
 
 @pytest.mark.asyncio
 async def test_is_admin_user_true(mocker):
+    rc._admin_cache.clear()
     # Simulate a response with admin role
-    mock_response = mocker.AsyncMock()
-    mock_response.json = mocker.AsyncMock(return_value={"provider": {"roles": ["admin", "user"]}})
-    mocker.patch.object(rc.requests, "get", return_value=mock_response)
+    mock_response = mocker.Mock()
+    mock_response.content = b'{"provider": {"roles": ["admin", "user"]}}'
+    mocker.patch.object(rc.requests, "get", new=mocker.AsyncMock(return_value=mock_response))
     result = await rc.is_admin_user("dummy_token")
     assert result is True
 
 
 @pytest.mark.asyncio
 async def test_is_admin_user_false(mocker):
+    rc._admin_cache.clear()
     # Simulate a response with no admin role
-    mock_response = mocker.AsyncMock()
-    mock_response.json = mocker.AsyncMock(return_value={"provider": {"roles": ["user"]}})
-    mocker.patch.object(rc.requests, "get", return_value=mock_response)
+    mock_response = mocker.Mock()
+    mock_response.content = b'{"provider": {"roles": ["user"]}}'
+    mocker.patch.object(rc.requests, "get", new=mocker.AsyncMock(return_value=mock_response))
     result = await rc.is_admin_user("dummy_token")
     assert result is False
 
 
 @pytest.mark.asyncio
 async def test_is_admin_user_exception(mocker):
+    rc._admin_cache.clear()
+
     # Simulate an exception in the request
     async def raise_exc(*args, **kwargs):
         raise Exception("fail")
@@ -50,3 +56,32 @@ async def test_is_admin_user_exception(mocker):
     mocker.patch.object(rc.requests, "get", side_effect=raise_exc)
     result = await rc.is_admin_user("dummy_token")
     assert result is False
+
+
+@pytest.mark.asyncio
+async def test_is_admin_user_cached(mocker):
+    rc._admin_cache.clear()
+    mock_response = mocker.Mock()
+    mock_response.content = b'{"provider": {"roles": ["admin"]}}'
+    mock_get = mocker.patch.object(rc.requests, "get", new=mocker.AsyncMock(return_value=mock_response))
+    assert await rc.is_admin_user("dummy_token") is True
+    assert await rc.is_admin_user("dummy_token") is True
+    assert mock_get.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_bookmarks_cached(mocker):
+    rc._list_cache.clear()
+    mock_response = mocker.Mock()
+    mock_response.content = b'[{"id": "abc"}]'
+    mock_get = mocker.patch.object(rc.requests, "get", new=mocker.AsyncMock(return_value=mock_response))
+
+    first = await rc.fetch_bookmarks("dummy_token", is_archived=False)
+    second = await rc.fetch_bookmarks("dummy_token", is_archived=False)
+    assert first == second == [{"id": "abc"}]
+    assert mock_get.await_count == 1
+
+    # Mutations drop the cached listings for that token
+    rc._invalidate_list_cache("dummy_token")
+    await rc.fetch_bookmarks("dummy_token", is_archived=False)
+    assert mock_get.await_count == 2